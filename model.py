@@ -1,244 +1,681 @@
-import os
-import json
-import re
-from typing import Dict, List, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-
-class InterviewPreparationModel:
-    def __init__(self, api_key: str):
-        """
-        Initialize the interview preparation model with Google's Generative AI
-        """
-        try:
-            self.llm = ChatGoogleGenerativeAI(
-                model="gemini-pro",
-                temperature=0,
-                max_tokens=None,
-                timeout=None,
-                max_retries=2,
-                google_api_key=api_key
-            )
-            # Reset all state variables
-            self.reset()
-        except Exception as e:
-            print(f"Error initializing model: {e}")
-            raise
-
-    def reset(self):
-        """
-        Reset the model's state
-        """
-        self.resume_data = None
-        self.interview_questions = []
-        self.current_question_index = 0
-
-    def parse_resume(self, file_path: str) -> Dict[str, Any]:
-        """
-        Parse the uploaded resume file and extract key details
-        """
-        try:
-            # Validate file exists and is a PDF
-            if not os.path.exists(file_path):
-                return {"error": f"File not found: {file_path}"}
-            
-            if not file_path.lower().endswith('.pdf'):
-                return {"error": "Only PDF files are supported"}
-
-            # Load the PDF resume and extract text
-            loader = PyPDFLoader(file_path)
-            documents = loader.load()
-
-            # Split the text for processing
-            splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-            chunks = splitter.split_documents(documents)
-
-            # Combine the text chunks for analysis
-            resume_content = "\n".join([chunk.page_content for chunk in chunks])
-
-            # Validate resume content
-            if not resume_content.strip():
-                return {"error": "Resume content is empty or could not be extracted."}
-
-            # Prompt for detailed resume analysis
-            prompt = f"""
-            Extract the following details from the resume content:
-            1. Skills
-            2. Work experience
-            3. Educational qualifications
-
-            Resume Content:
-            {resume_content}
-
-            Please provide a detailed JSON response with:
-            1. Professional skills (technical and soft skills)
-            2. Work experience details
-            3. Educational qualifications
-            4. Notable achievements or certifications
-
-            Strictly format as a JSON object with clear, concise information.
-            """
-                
-            # Invoke the model
-            try:
-                response = self.llm.invoke(prompt)
-                
-                # Parse the JSON response
-                try:
-                    # Clean potential markdown code block
-                    content = response.content
-                    json_match = re.search(r'```json\n(.*?)```', content, re.DOTALL)
-                    if json_match:
-                        content = json_match.group(1)
-                    
-                    # Parse JSON
-                    parsed_data = json.loads(content)
-                    
-                    # Store and validate parsed data
-                    if not parsed_data or not isinstance(parsed_data, dict):
-                        return {"error": "Invalid resume data structure"}
-                    
-                    self.resume_data = parsed_data
-                    return parsed_data
-                
-                except json.JSONDecodeError as je:
-                    return {
-                        "error": f"Failed to parse resume data: {str(je)}",
-                        "raw_response": response.content
-                    }
-            
-            except Exception as model_error:
-                return {"error": f"Model invocation failed: {str(model_error)}"}
-        
-        except Exception as e:
-            return {"error": f"Unexpected error parsing resume: {str(e)}"}
-
-    def generate_interview_questions(self) -> List[str]:
-        """
-        Generate personalized interview questions based on resume
-        """
-        # Fallback to generic questions if no resume data
-        if not self.resume_data or "error" in self.resume_data:
-            self.interview_questions = [
-                "Tell me about yourself and your professional background.",
-                "What are your key strengths and areas of expertise?",
-                "Describe a challenging project you've worked on and how you overcame obstacles.",
-                "Where do you see yourself professionally in the next 5 years?",
-                "What motivates you in your career?"
-            ]
-            return self.interview_questions
-
-        # Generate specific questions based on resume
-        prompt = f"""
-        Generate 5 personalized interview questions exploring the candidate's background:
-
-        Skills: {self.resume_data.get('skills', [])}
-        Experience: {json.dumps(self.resume_data.get('experience', []))}
-        Education: {json.dumps(self.resume_data.get('education', []))}
-
-        Questions should:
-        - Be specific to the candidate's unique background
-        - Cover technical and soft skill aspects
-        - Encourage detailed responses
-        - Reveal problem-solving capabilities
-        """
-
-        try:
-            response = self.llm.invoke(prompt)
-            
-            # Clean and process questions
-            self.interview_questions = [
-                q.strip().replace('Q: ', '').replace('Question: ', '') 
-                for q in response.content.split('\n') 
-                if q.strip() and len(q.strip()) > 10
-            ]
-
-            # Fallback to generic questions if generation fails
-            if not self.interview_questions:
-                self.interview_questions = [
-                    "Tell me about yourself and your professional background.",
-                    "What are your key strengths and areas of expertise?",
-                    "Describe a challenging project you've worked on and how you overcame obstacles.",
-                    "Where do you see yourself professionally in the next 5 years?",
-                    "What motivates you in your career?"
-                ]
-
-            return self.interview_questions
-        
-        except Exception as e:
-            print(f"Error generating questions: {e}")
-            self.interview_questions = [
-                "Tell me about yourself and your professional background.",
-                "What are your key strengths and areas of expertise?",
-                "Describe a challenging project you've worked on and how you overcame obstacles.",
-                "Where do you see yourself professionally in the next 5 years?",
-                "What motivates you in your career?"
-            ]
-            return self.interview_questions
-
-    def evaluate_answer(self, question: str, answer: str) -> str:
-        """
-        Provide detailed, constructive feedback on interview answers with enhanced context awareness
-        """
-        # Build context from resume data if available
-        context = ""
-        if self.resume_data:
-            context = f"""
-            Candidate Background:
-            - Skills: {json.dumps(self.resume_data.get('skills', []))}
-            - Experience Level: {len(self.resume_data.get('experience', []))} years
-            - Technical Background: {json.dumps(self.resume_data.get('skills', {}).get('technical', []))}
-            """
-
-        prompt = f"""
-        You are an experienced technical interviewer and career coach. Evaluate the following interview response 
-        considering the candidate's background and the context of the question.
-
-        {context}
-
-        Question: {question}
-        Candidate's Answer: {answer}
-
-        Provide a comprehensive evaluation structured as follows:
-
-        1. Content Analysis:
-        - Key points effectively communicated
-        - Technical accuracy and depth of knowledge demonstrated
-        - Relevant experience and examples used
-        - Alignment with industry best practices
-
-        2. Communication Skills:
-        - Clarity and structure of the response
-        - Professional language and terminology usage
-        - Confidence and authority in presentation
-        - Balance between technical and non-technical explanation
-
-        3. Strategic Assessment:
-        - Alignment with what interviewers typically look for
-        - Understanding of the underlying business/technical context
-        - Problem-solving approach demonstrated
-        - Strategic thinking and decision-making shown
-
-        4. Specific Improvements:
-        - Missing key points or opportunities
-        - Alternative approaches or examples to consider
-        - Ways to make the answer more impactful
-        - Suggestions for better structuring the response
-
-        5. Follow-up Discussion:
-        - Natural follow-up questions this answer might prompt
-        - Areas worth exploring further
-        - Technical deep-dives that could be relevant
-        - Related scenarios to demonstrate broader knowledge
-
-        Keep feedback constructive, specific, and actionable. Focus on both immediate interview success 
-        and long-term career development. If the answer involves technical concepts, evaluate both the 
-        technical accuracy and the ability to communicate complex ideas effectively.
-        """
-
-        try:
-            response = self.llm.invoke(prompt)
-            return response.content
-        except Exception as e:
-            return f"Error generating feedback. Please try again. Details: {str(e)}"
\ No newline at end of file
+import os
+import hashlib
+import json
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any
+import diskcache
+import numpy as np
+import pypdfium2 as pdfium
+from sentence_transformers import SentenceTransformer
+from google.api_core import exceptions as google_exceptions
+from langchain_google_genai import ChatGoogleGenerativeAI
+import tiktoken
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+
+# Compiled once at import; runs on every batched-evaluation response
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)```', re.DOTALL)
+
+# Bump when any prompt template or model assignment changes so stale cached
+# outputs are not reused
+_PROMPT_TEMPLATE_VERSION = "3"
+
+# Retry transient provider failures with jittered exponential backoff so a
+# burst of rate-limit errors does not produce synchronized retries
+_RETRYABLE_ERRORS = (
+    TimeoutError,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+)
+_llm_retry = retry(
+    wait=wait_exponential_jitter(initial=0.2, max=4),
+    stop=stop_after_attempt(3),
+    retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+    reraise=True,
+)
+
+# Cap on resume text sent to the model; the first ~4K tokens carry everything
+# the extraction prompts need, and input tokens are billed per call
+_TOKEN_ENCODING = tiktoken.get_encoding('cl100k_base')
+_MAX_RESUME_TOKENS = 4000
+
+# Dedicated pool for fanning out resume-section subprompts; kept separate
+# from the app's request pool so saturated request workers cannot starve
+# the subtasks they are waiting on
+_SECTION_POOL = ThreadPoolExecutor(max_workers=12)
+
+# Persistent cache of model outputs keyed by SHA-256 of the input
+_LLM_CACHE = diskcache.Cache('.cache/llm')
+
+# Small in-process layer so repeat hits skip the disk read entirely
+_MEMORY_CACHE: Dict[str, str] = {}
+_MEMORY_CACHE_MAX = 512
+
+
+class AnswerSimilarityCache:
+    """
+    Fuzzy cache of past evaluations keyed by a sentence embedding of the
+    (question, answer) pair.
+
+    Minor rewordings of the same answer embed close together, so a cosine
+    similarity above `threshold` reuses the earlier feedback instead of
+    paying for a fresh model call. Entries are partitioned by a context key
+    (a hash of the candidate background that produced them) so feedback is
+    never reused across different resumes. Each partition persists on disk
+    so restarts stay warm.
+    """
+
+    def __init__(self, path: str = '.cache/answers', threshold: float = 0.95):
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._embedder_lock = threading.Lock()
+        self._embedder = None
+        # context_key -> (L2-normalized (N, dim) vectors or None, feedbacks)
+        self._partitions: Dict[str, Any] = {}
+
+    def _partition_file(self, context_key: str) -> str:
+        return os.path.join(self.path, f'{context_key}.npz')
+
+    def _get_partition(self, context_key: str):
+        # Caller must hold self._lock
+        if context_key not in self._partitions:
+            try:
+                data = np.load(self._partition_file(context_key), allow_pickle=True)
+                self._partitions[context_key] = (data['vectors'], list(data['feedbacks']))
+            except FileNotFoundError:
+                self._partitions[context_key] = (None, [])
+            except Exception as e:
+                # A truncated or corrupt file (BadZipFile, UnpicklingError, ...)
+                # must not poison this context forever; start the partition over
+                print(f"Resetting corrupt similarity-cache partition {context_key}: {e}")
+                self._partitions[context_key] = (None, [])
+        return self._partitions[context_key]
+
+    def _embed(self, question: str, answer: str):
+        # The 22 MB MiniLM model loads lazily so import stays cheap
+        if self._embedder is None:
+            with self._embedder_lock:
+                if self._embedder is None:
+                    self._embedder = SentenceTransformer('all-MiniLM-L6-v2')
+        return self._embedder.encode(f"{question}\n{answer}", normalize_embeddings=True)
+
+    def lookup(self, context_key: str, question: str, answer: str):
+        """
+        Return cached feedback for a near-duplicate pair in this context,
+        or None. Never raises: any cache failure reads as a miss so the
+        caller falls through to a fresh model call.
+        """
+        try:
+            vec = self._embed(question, answer)
+            with self._lock:
+                vectors, feedbacks = self._get_partition(context_key)
+                if vectors is None or not len(feedbacks):
+                    return None
+                scores = vectors @ vec
+                best = int(np.argmax(scores))
+                if scores[best] > self.threshold:
+                    return feedbacks[best]
+        except Exception as e:
+            print(f"Similarity cache lookup failed: {e}")
+        return None
+
+    def store(self, context_key: str, question: str, answer: str, feedback: str):
+        """
+        Add this pair's embedding and feedback to its context partition
+        and persist it. Never raises: a failed store only costs a future
+        cache hit.
+        """
+        try:
+            vec = self._embed(question, answer)
+            with self._lock:
+                vectors, feedbacks = self._get_partition(context_key)
+                feedbacks.append(feedback)
+                if vectors is None:
+                    vectors = vec[np.newaxis, :]
+                else:
+                    vectors = np.vstack([vectors, vec])
+                self._partitions[context_key] = (vectors, feedbacks)
+                os.makedirs(self.path, exist_ok=True)
+                # Write to a per-process temp file and rename into place so a
+                # concurrent worker never reads a half-written partition
+                tmp_file = self._partition_file(context_key) + f'.{os.getpid()}.tmp'
+                with open(tmp_file, 'wb') as f:
+                    np.savez(
+                        f,
+                        vectors=vectors,
+                        feedbacks=np.array(feedbacks, dtype=object),
+                    )
+                os.replace(tmp_file, self._partition_file(context_key))
+        except Exception as e:
+            print(f"Similarity cache store failed: {e}")
+
+
+_ANSWER_CACHE = AnswerSimilarityCache()
+
+
+class InterviewPreparationModel:
+    # Fallback questions used whenever resume-based generation is unavailable
+    _GENERIC_QUESTIONS = (
+        "Tell me about yourself and your professional background.",
+        "What are your key strengths and areas of expertise?",
+        "Describe a challenging project you've worked on and how you overcame obstacles.",
+        "Where do you see yourself professionally in the next 5 years?",
+        "What motivates you in your career?"
+    )
+
+    # Independent extraction subprompts run concurrently over the same resume text
+    _RESUME_SECTION_PROMPTS = {
+        "skills": """
+        Extract the candidate's professional skills from the resume content below.
+
+        Resume Content:
+        {resume_content}
+
+        Strictly reply with a JSON object of the form:
+        {{"skills": {{"technical": ["..."], "soft": ["..."]}}}}
+        """,
+        "experience": """
+        Extract the candidate's work experience from the resume content below.
+
+        Resume Content:
+        {resume_content}
+
+        Strictly reply with a JSON object of the form:
+        {{"experience": [{{"title": "...", "company": "...", "duration": "...", "highlights": ["..."]}}]}}
+        """,
+        "education": """
+        Extract the candidate's educational qualifications and any notable
+        achievements or certifications from the resume content below.
+
+        Resume Content:
+        {resume_content}
+
+        Strictly reply with a JSON object of the form:
+        {{"education": [{{"degree": "...", "institution": "...", "year": "..."}}], "certifications": ["..."]}}
+        """,
+    }
+
+    def __init__(self, api_key: str):
+        """
+        Initialize the interview preparation model with Google's Generative AI
+        """
+        try:
+            # Small, cheap model for structured extraction and question
+            # generation; both emit short JSON/lists so a tight output cap
+            # is safe and bounds tail latency
+            self.llm_fast = ChatGoogleGenerativeAI(
+                model="gemini-1.5-flash-8b",
+                temperature=0,
+                max_output_tokens=512,
+                timeout=15,
+                max_retries=0,
+                google_api_key=api_key,
+                # Constrain decoding to valid JSON so responses never need
+                # markdown-fence stripping or retry-on-parse-failure
+                response_mime_type="application/json"
+            )
+            # Larger model reserved for the open-ended answer evaluation
+            self.llm_deep = ChatGoogleGenerativeAI(
+                model="gemini-1.5-pro",
+                temperature=0,
+                max_output_tokens=1536,
+                timeout=15,
+                max_retries=0,
+                google_api_key=api_key
+            )
+            # Reset all state variables
+            self.reset()
+        except Exception as e:
+            print(f"Error initializing model: {e}")
+            raise
+
+    def reset(self):
+        """
+        Reset the model's state
+        """
+        self.resume_data = None
+        self.interview_questions = []
+        self.current_question_index = 0
+        self._context_cached = ""
+
+    def _build_context(self, parsed_data: Dict[str, Any]) -> str:
+        """
+        Render the candidate-background block shared by every evaluation
+        prompt; resume data is immutable per session so this runs once.
+        """
+        skills = parsed_data.get('skills', {})
+        technical = skills.get('technical', []) if isinstance(skills, dict) else skills
+        return f"""
+            Candidate Background:
+            - Skills: {json.dumps(skills)}
+            - Experience Level: {len(parsed_data.get('experience', []))} years
+            - Technical Background: {json.dumps(technical)}
+            """
+
+    def _context_key(self) -> str:
+        """
+        Hash of the session context, used to partition the similarity cache
+        so feedback is never reused across different resumes.
+        """
+        return hashlib.sha256(self._context_cached.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _cache_key(*parts: bytes) -> bytes:
+        """
+        Build a SHA-256 cache key over the prompt template version plus inputs.
+        """
+        digest = hashlib.sha256(_PROMPT_TEMPLATE_VERSION.encode())
+        for part in parts:
+            digest.update(part)
+        return digest.digest()
+
+    @staticmethod
+    def _cache_lookup(key_bytes: bytes) -> str:
+        """
+        Return the cached model output for this key, or None on a miss.
+        """
+        key = key_bytes.hex()
+        content = _MEMORY_CACHE.get(key)
+        if content is None:
+            content = _LLM_CACHE.get(key)
+            if content is not None and len(_MEMORY_CACHE) < _MEMORY_CACHE_MAX:
+                _MEMORY_CACHE[key] = content
+        return content
+
+    @staticmethod
+    def _cache_store(key_bytes: bytes, content: str):
+        """
+        Persist a model output under this key in both cache layers.
+        """
+        key = key_bytes.hex()
+        _LLM_CACHE.set(key, content)
+        if len(_MEMORY_CACHE) < _MEMORY_CACHE_MAX:
+            _MEMORY_CACHE[key] = content
+
+    @_llm_retry
+    def _invoke(self, prompt: str, llm) -> str:
+        """
+        Invoke the given model with backoff on transient provider errors.
+        """
+        return llm.invoke(prompt).content
+
+    def _cached_invoke(self, key_bytes: bytes, prompt: str, llm) -> str:
+        """
+        Invoke the given model, reusing a cached response for identical inputs.
+        """
+        content = self._cache_lookup(key_bytes)
+        if content is not None:
+            return content
+
+        content = self._invoke(prompt, llm)
+        self._cache_store(key_bytes, content)
+        return content
+
+    def parse_resume(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse the uploaded resume file and extract key details
+        """
+        try:
+            # Validate file exists and is a PDF
+            if not os.path.exists(file_path):
+                return {"error": f"File not found: {file_path}"}
+            
+            if not file_path.lower().endswith('.pdf'):
+                return {"error": "Only PDF files are supported"}
+
+            # Key each section on the raw PDF bytes so a repeat upload skips
+            # both text extraction and the model calls
+            with open(file_path, 'rb') as f:
+                pdf_bytes = f.read()
+            cache_keys = {
+                section: self._cache_key(f'parse_resume:{section}:'.encode(), pdf_bytes)
+                for section in self._RESUME_SECTION_PROMPTS
+            }
+            contents = {
+                section: self._cache_lookup(key) for section, key in cache_keys.items()
+            }
+
+            if any(content is None for content in contents.values()):
+                # Extract the text directly; no chunking needed since the
+                # whole resume goes into one prompt anyway
+                pdf = pdfium.PdfDocument(file_path)
+                try:
+                    resume_content = "\n".join(
+                        page.get_textpage().get_text_range() for page in pdf
+                    )
+                finally:
+                    pdf.close()
+
+                # Validate resume content
+                if not resume_content.strip():
+                    return {"error": "Resume content is empty or could not be extracted."}
+
+                # Truncate oversized resumes to the token budget
+                token_ids = _TOKEN_ENCODING.encode(resume_content)
+                if len(token_ids) > _MAX_RESUME_TOKENS:
+                    resume_content = _TOKEN_ENCODING.decode(token_ids[:_MAX_RESUME_TOKENS])
+
+                # Run the section subprompts concurrently on the pool;
+                # latency is the slowest call rather than the sum of all three
+                futures = {
+                    section: _SECTION_POOL.submit(
+                        self._cached_invoke,
+                        cache_keys[section],
+                        template.format(resume_content=resume_content),
+                        self.llm_fast,
+                    )
+                    for section, template in self._RESUME_SECTION_PROMPTS.items()
+                }
+
+                # Invoke the model
+                try:
+                    contents = {
+                        section: future.result(timeout=60)
+                        for section, future in futures.items()
+                    }
+                except Exception as model_error:
+                    return {"error": f"Model invocation failed: {str(model_error)}"}
+
+            # Merge the per-section responses; JSON mode guarantees each one
+            # is a valid JSON document
+            parsed_data = {}
+            for section, content in contents.items():
+                try:
+                    parsed_data.update(json.loads(content))
+                except json.JSONDecodeError as je:
+                    return {
+                        "error": f"Failed to parse resume data: {str(je)}",
+                        "raw_response": content
+                    }
+
+            # Store and validate parsed data
+            if not parsed_data or not isinstance(parsed_data, dict):
+                return {"error": "Invalid resume data structure"}
+
+            self.resume_data = parsed_data
+            self._context_cached = self._build_context(parsed_data)
+            return parsed_data
+        
+        except Exception as e:
+            return {"error": f"Unexpected error parsing resume: {str(e)}"}
+
+    def generate_interview_questions(self) -> List[str]:
+        """
+        Generate personalized interview questions based on resume
+        """
+        # Fallback to generic questions if no resume data
+        if not self.resume_data or "error" in self.resume_data:
+            self.interview_questions = list(self._GENERIC_QUESTIONS)
+            return self.interview_questions
+
+        # Generate specific questions based on resume
+        prompt = f"""
+        Generate 5 personalized interview questions exploring the candidate's background:
+
+        Skills: {self.resume_data.get('skills', [])}
+        Experience: {json.dumps(self.resume_data.get('experience', []))}
+        Education: {json.dumps(self.resume_data.get('education', []))}
+
+        Questions should:
+        - Be specific to the candidate's unique background
+        - Cover technical and soft skill aspects
+        - Encourage detailed responses
+        - Reveal problem-solving capabilities
+
+        Strictly reply with a JSON object of the form: {{"questions": ["..."]}}
+        """
+
+        try:
+            content = self._cached_invoke(self._cache_key(prompt.encode()), prompt, self.llm_fast)
+
+            # Clean and process questions
+            self.interview_questions = [
+                q.strip()
+                for q in json.loads(content).get('questions', [])
+                if q.strip() and len(q.strip()) > 10
+            ]
+
+            # Fallback to generic questions if generation fails
+            if not self.interview_questions:
+                self.interview_questions = list(self._GENERIC_QUESTIONS)
+
+            return self.interview_questions
+        
+        except Exception as e:
+            print(f"Error generating questions: {e}")
+            self.interview_questions = list(self._GENERIC_QUESTIONS)
+            return self.interview_questions
+
+    def _evaluation_prompt(self, question: str, answer: str) -> str:
+        """
+        Build the full evaluation prompt for a single (question, answer) pair.
+        """
+        # Context is rendered once when the resume is parsed
+        context = self._context_cached
+
+        return f"""
+        You are an experienced technical interviewer and career coach. Evaluate the following interview response 
+        considering the candidate's background and the context of the question.
+
+        {context}
+
+        Question: {question}
+        Candidate's Answer: {answer}
+
+        Provide a comprehensive evaluation structured as follows:
+
+        1. Content Analysis:
+        - Key points effectively communicated
+        - Technical accuracy and depth of knowledge demonstrated
+        - Relevant experience and examples used
+        - Alignment with industry best practices
+
+        2. Communication Skills:
+        - Clarity and structure of the response
+        - Professional language and terminology usage
+        - Confidence and authority in presentation
+        - Balance between technical and non-technical explanation
+
+        3. Strategic Assessment:
+        - Alignment with what interviewers typically look for
+        - Understanding of the underlying business/technical context
+        - Problem-solving approach demonstrated
+        - Strategic thinking and decision-making shown
+
+        4. Specific Improvements:
+        - Missing key points or opportunities
+        - Alternative approaches or examples to consider
+        - Ways to make the answer more impactful
+        - Suggestions for better structuring the response
+
+        5. Follow-up Discussion:
+        - Natural follow-up questions this answer might prompt
+        - Areas worth exploring further
+        - Technical deep-dives that could be relevant
+        - Related scenarios to demonstrate broader knowledge
+
+        Keep feedback constructive, specific, and actionable. Focus on both immediate interview success 
+        and long-term career development. If the answer involves technical concepts, evaluate both the 
+        technical accuracy and the ability to communicate complex ideas effectively.
+        """
+
+    def evaluate_answer(self, question: str, answer: str) -> str:
+        """
+        Provide detailed, constructive feedback on interview answers with enhanced context awareness
+        """
+        # Near-duplicate answers (typo-level rewordings) reuse earlier feedback
+        context_key = self._context_key()
+        cached = _ANSWER_CACHE.lookup(context_key, question, answer)
+        if cached is not None:
+            return cached
+
+        prompt = self._evaluation_prompt(question, answer)
+
+        try:
+            feedback = self._cached_invoke(self._cache_key(prompt.encode()), prompt, self.llm_deep)
+        except Exception as e:
+            return f"Error generating feedback. Please try again. Details: {str(e)}"
+
+        _ANSWER_CACHE.store(context_key, question, answer, feedback)
+        return feedback
+
+    def stream_evaluate(self, question: str, answer: str):
+        """
+        Yield feedback text incrementally so callers can flush tokens as
+        they arrive instead of waiting for the full evaluation.
+        """
+        prompt = self._evaluation_prompt(question, answer)
+        cache_key = self._cache_key(prompt.encode())
+
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        for chunk in self.llm_deep.stream(prompt):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield chunk.content
+        self._cache_store(cache_key, "".join(parts))
+
+    def evaluate_answers_batch(self, items: List[Dict[str, str]]) -> Dict[int, str]:
+        """
+        Evaluate several (question, answer) pairs in a single model call.
+
+        Each item is {"id": ..., "question": ..., "answer": ...}; returns a
+        mapping of id -> feedback text. Falls back to per-item evaluation if
+        the batched response cannot be parsed.
+        """
+        # Context is rendered once when the resume is parsed
+        context = self._context_cached
+
+        # Serve items both caches already know about; only misses go to the model
+        context_key = self._context_key()
+        feedback_by_id = {}
+        pending = []
+        for item in items:
+            cached = _ANSWER_CACHE.lookup(context_key, item["question"], item["answer"])
+            if cached is None:
+                prompt_key = self._cache_key(
+                    self._evaluation_prompt(item["question"], item["answer"]).encode()
+                )
+                cached = self._cache_lookup(prompt_key)
+            if cached is not None:
+                feedback_by_id[item["id"]] = cached
+            else:
+                pending.append(item)
+
+        if not pending:
+            return feedback_by_id
+
+        prompt = f"""
+        You are an experienced technical interviewer and career coach. Evaluate each of the
+        following interview responses considering the candidate's background.
+
+        {context}
+
+        Responses to evaluate (JSON list):
+        {json.dumps([{"id": item["id"], "question": item["question"], "answer": item["answer"]} for item in pending])}
+
+        For every response, cover: content analysis, communication skills, strategic
+        assessment, specific improvements, and natural follow-up questions. Keep feedback
+        constructive, specific, and actionable.
+
+        Strictly reply with a JSON list of objects: [{{"id": <id>, "feedback": "<full feedback text>"}}, ...]
+        with one entry per input id and no other text.
+        """
+
+        try:
+            content = self._invoke(prompt, self.llm_deep)
+            json_match = _JSON_BLOCK_RE.search(content)
+            if json_match:
+                content = json_match.group(1)
+            results = json.loads(content)
+            batch_feedback = {entry["id"]: entry["feedback"] for entry in results}
+            if all(item["id"] in batch_feedback for item in pending):
+                # Feed both caches so repeats and rewordings hit next time
+                for item in pending:
+                    feedback = batch_feedback[item["id"]]
+                    prompt_key = self._cache_key(
+                        self._evaluation_prompt(item["question"], item["answer"]).encode()
+                    )
+                    self._cache_store(prompt_key, feedback)
+                    _ANSWER_CACHE.store(context_key, item["question"], item["answer"], feedback)
+                feedback_by_id.update(batch_feedback)
+                return feedback_by_id
+        except Exception as e:
+            print(f"Batched evaluation failed, falling back to per-item calls: {e}")
+
+        # Fallback: evaluate each answer individually
+        for item in pending:
+            feedback_by_id[item["id"]] = self.evaluate_answer(item["question"], item["answer"])
+        return feedback_by_id
+
+
+class BatchedEvaluator:
+    """
+    Micro-batches concurrent evaluate-answer requests into one model call.
+
+    Requests are buffered until either `max_batch_size` are waiting or
+    `max_wait` seconds have passed since the first one arrived, then flushed
+    as a single multi-answer prompt. Callers get a Future resolved with
+    their individual feedback.
+    """
+
+    def __init__(self, model: InterviewPreparationModel, max_batch_size: int = 8, max_wait: float = 0.02):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, question: str, answer: str) -> Future:
+        """
+        Queue a (question, answer) pair; the Future resolves to feedback text.
+        """
+        future = Future()
+        self._queue.put((question, answer, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # Flush off-thread so the collector keeps forming new batches
+            # while this one's model call is in flight
+            threading.Thread(target=self._flush, args=(batch,), daemon=True).start()
+
+    def _flush(self, batch):
+        try:
+            if len(batch) == 1:
+                # No batching win for a single request; keep the richer prompt
+                question, answer, future = batch[0]
+                future.set_result(self.model.evaluate_answer(question, answer))
+                return
+
+            items = [
+                {"id": i, "question": question, "answer": answer}
+                for i, (question, answer, _) in enumerate(batch)
+            ]
+            feedback_by_id = self.model.evaluate_answers_batch(items)
+            for i, (_, _, future) in enumerate(batch):
+                future.set_result(feedback_by_id[i])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
\ No newline at end of file